@@ -12,24 +12,102 @@ import csv
 from datetime import datetime
 import webbrowser
 import os
+import socket
+import zipfile
 
 import numpy as np
-import pyvisa
 
 import matplotlib
 matplotlib.use("TkAgg")
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 from matplotlib.patches import Rectangle
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment
 
 DEFAULT_IP1 = "192.168.60.70"
 DEFAULT_IP2 = "192.168.60.69"
 
+SCPI_SOCKET_PORT = 5555
+
 YMIN_DBM = -120
 YMAX_DBM = 0
 
+MAX_REDRAW_HZ = 15
+
+
+# Static parts of the minimal .xlsx package written by SpectrumPlot._write_excel
+XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Spectrum Data" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+XLSX_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><color rgb="FF00D4FF"/><name val="Calibri"/></font></fonts>'
+    '<fills count="3"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FF1A1A2E"/><bgColor rgb="FF1A1A2E"/></patternFill></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="0" xfId="0" applyFont="1" applyFill="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+XLSX_SHEET_HEAD = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    b'<cols><col min="1" max="2" width="18" customWidth="1"/></cols><sheetData>'
+)
+XLSX_SHEET_TAIL = b'</sheetData></worksheet>'
+# Cell references are optional in SpreadsheetML; without them the cells fill columns A, B in order
+XLSX_DATA_ROW = '<row r="%d"><c><v>%.6f</v></c><c><v>%.2f</v></c></row>'
+
+
+def _decimate(freqs, vals, n_pixels):
+    """Min/max decimate a trace to two points per pixel column so narrow peaks stay visible"""
+    starts = np.linspace(0, len(vals), n_pixels, endpoint=False).astype(np.intp)
+    ends = np.append(starts[1:], len(vals))
+    x = np.column_stack((freqs[starts], freqs[ends - 1])).ravel()
+    y = np.column_stack((np.minimum.reduceat(vals, starts), np.maximum.reduceat(vals, starts))).ravel()
+    return x, y
+
+
+def _nearest_index(freqs, x):
+    """Index of the sample closest to x on an ascending frequency axis"""
+    i = int(np.searchsorted(freqs, x))
+    if i == 0:
+        return 0
+    if i >= len(freqs):
+        return len(freqs) - 1
+    return i if (freqs[i] - x) < (x - freqs[i - 1]) else i - 1
+
+
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
@@ -300,28 +378,28 @@ class SpectrumAnalyzerPanel(ctk.CTkFrame):
         self.start_stop_frame.pack(side="left", fill="x", expand=True)
         
         ctk.CTkLabel(self.start_stop_frame, text="Start:", font=ctk.CTkFont(size=10), text_color="#888888").pack(side="left", padx=(0, 3))
-        self.start_entry = ctk.CTkEntry(self.start_stop_frame, width=60, font=ctk.CTkFont(size=11), justify="center")
-        self.start_entry.insert(0, "0")
+        self.start_var = ctk.StringVar(value="0")
+        self.start_entry = ctk.CTkEntry(self.start_stop_frame, width=60, font=ctk.CTkFont(size=11), justify="center", textvariable=self.start_var)
         self.start_entry.pack(side="left", padx=0)
         ctk.CTkLabel(self.start_stop_frame, text="MHz", font=ctk.CTkFont(size=9), text_color="#666666").pack(side="left", padx=3)
         
         ctk.CTkLabel(self.start_stop_frame, text="Stop:", font=ctk.CTkFont(size=10), text_color="#888888").pack(side="left", padx=(15, 3))
-        self.stop_entry = ctk.CTkEntry(self.start_stop_frame, width=60, font=ctk.CTkFont(size=11), justify="center")
-        self.stop_entry.insert(0, "3000")
+        self.stop_var = ctk.StringVar(value="3000")
+        self.stop_entry = ctk.CTkEntry(self.start_stop_frame, width=60, font=ctk.CTkFont(size=11), justify="center", textvariable=self.stop_var)
         self.stop_entry.pack(side="left", padx=0)
         ctk.CTkLabel(self.start_stop_frame, text="MHz", font=ctk.CTkFont(size=9), text_color="#666666").pack(side="left", padx=3)
         
         self.center_span_frame = ctk.CTkFrame(row2, fg_color="transparent")
         
         ctk.CTkLabel(self.center_span_frame, text="Center:", font=ctk.CTkFont(size=10), text_color="#888888").pack(side="left", padx=(0, 3))
-        self.center_entry = ctk.CTkEntry(self.center_span_frame, width=60, font=ctk.CTkFont(size=11), justify="center")
-        self.center_entry.insert(0, "1000")
+        self.center_var = ctk.StringVar(value="1000")
+        self.center_entry = ctk.CTkEntry(self.center_span_frame, width=60, font=ctk.CTkFont(size=11), justify="center", textvariable=self.center_var)
         self.center_entry.pack(side="left", padx=0)
         ctk.CTkLabel(self.center_span_frame, text="MHz", font=ctk.CTkFont(size=9), text_color="#666666").pack(side="left", padx=3)
         
         ctk.CTkLabel(self.center_span_frame, text="Span:", font=ctk.CTkFont(size=10), text_color="#888888").pack(side="left", padx=(15, 3))
-        self.span_entry = ctk.CTkEntry(self.center_span_frame, width=60, font=ctk.CTkFont(size=11), justify="center")
-        self.span_entry.insert(0, "2000")
+        self.span_var = ctk.StringVar(value="2000")
+        self.span_entry = ctk.CTkEntry(self.center_span_frame, width=60, font=ctk.CTkFont(size=11), justify="center", textvariable=self.span_var)
         self.span_entry.pack(side="left", padx=0)
         ctk.CTkLabel(self.center_span_frame, text="MHz", font=ctk.CTkFont(size=9), text_color="#666666").pack(side="left", padx=3)
         
@@ -373,6 +451,16 @@ class SpectrumAnalyzerPanel(ctk.CTkFrame):
         )
         self.message_label.pack(side="right", padx=10)
     
+    def get_freq_range(self):
+        """Return the (start, stop) MHz range for the active frequency mode; call on the Tk thread"""
+        if self.freq_mode == "center_span":
+            center = float(self.center_var.get().replace(",", "."))
+            span = float(self.span_var.get().replace(",", "."))
+            return center - span / 2, center + span / 2
+        start = float(self.start_var.get().replace(",", "."))
+        stop = float(self.stop_var.get().replace(",", "."))
+        return start, stop
+    
     def _toggle_collapse(self):
         self.is_collapsed = not self.is_collapsed
         if self.is_collapsed:
@@ -444,15 +532,15 @@ class SpectrumPlot(ctk.CTkFrame):
         self.line_current = None
         self.line_max = None
         
-        self.current_freqs = None
+        self.current_freqs_mhz = None
         self.current_vals = None
         self.current_max_vals = None
-        self.previous_freq_range = None
+        self._line_axis = None
         
         self.marker_line = None
         self.marker_dot = None
-        self.marker_annotation = None
         self.marker_x = None
+        self._marker_idx = None
         self.dragging = False
         
         self.zoom_dragging = False
@@ -463,6 +551,12 @@ class SpectrumPlot(ctk.CTkFrame):
         self.original_xlim = None
         self.original_ylim = None
         
+        self._bg = None
+        self._clip_buf = None
+        self._pending_data = None
+        self._redraw_scheduled = False
+        self._min_interval_ms = int(1000 / MAX_REDRAW_HZ)
+        
         self.fig = Figure(figsize=(8, 3), dpi=100, facecolor='#1a1a2e')
         self.ax = self.fig.add_subplot(111)
         self._style_axis()
@@ -475,6 +569,10 @@ class SpectrumPlot(ctk.CTkFrame):
         self.canvas.mpl_connect('button_release_event', self._on_release)
         
         self.fig.tight_layout(pad=2)
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        # Plot width in pixels, the decimation target; only changes when the canvas is resized
+        self._n_pixels = int(self.ax.bbox.width)
+        self.canvas.mpl_connect('resize_event', self._on_resize)
         
         self.marker_info_frame = ctk.CTkFrame(self, fg_color="#0f0f23", corner_radius=6)
         self.marker_info_frame.pack(fill="x", padx=10, pady=(0, 10))
@@ -542,35 +640,79 @@ class SpectrumPlot(ctk.CTkFrame):
         self.ax.set_ylabel("Amplitude (dBm)", fontsize=12, fontweight="bold")
         self.ax.set_ylim(YMIN_DBM, YMAX_DBM)
     
+    def _on_draw(self, event):
+        """Cache the static background after every full draw, then repaint the animated artists"""
+        self._bg = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_animated()
+    
+    def _draw_animated(self):
+        for artist in (self.line_current, self.line_max, self.marker_line, self.marker_dot, self.zoom_rect):
+            if artist is not None:
+                self.ax.draw_artist(artist)
+    
+    def _blit(self):
+        """Repaint only the traces and marker on top of the cached background"""
+        if self._bg is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._bg)
+        self._draw_animated()
+        self.canvas.blit(self.ax.bbox)
+    
+    def _display_data(self, freqs, vals):
+        """Return the trace as drawn: clipped to the amplitude range and decimated to the plot width unless zoomed in"""
+        n_pixels = self._n_pixels
+        if not self.zoom_history and n_pixels > 0 and len(vals) > 2 * n_pixels:
+            x, y = _decimate(freqs, vals, n_pixels)
+            np.clip(y, YMIN_DBM, YMAX_DBM, out=y)
+            return x, y
+        
+        # Pre-clip to the fixed amplitude range so the renderer never clips the path itself.
+        # Line2D copies its data, so one scratch buffer can serve both traces.
+        if self._clip_buf is None or self._clip_buf.shape != vals.shape or self._clip_buf.dtype != vals.dtype:
+            self._clip_buf = np.empty_like(vals)
+        np.clip(vals, YMIN_DBM, YMAX_DBM, out=self._clip_buf)
+        return freqs, self._clip_buf
+    
+    def _on_resize(self, event):
+        """Track the new plot width and re-decimate the traces for the redraw that follows"""
+        self._n_pixels = int(self.ax.bbox.width)
+        if self.current_freqs_mhz is not None:
+            self._refresh_lines()
+    
+    def _refresh_lines(self):
+        """Re-apply the trace data after a zoom change switches decimation on or off"""
+        if self.line_current is not None:
+            self.line_current.set_data(*self._display_data(self.current_freqs_mhz, self.current_vals))
+        if self.line_max is not None and self.current_max_vals is not None:
+            self.line_max.set_data(*self._display_data(self.current_freqs_mhz, self.current_max_vals))
+    
     def _on_click(self, event):
-        if event.inaxes != self.ax or self.current_freqs is None:
+        if event.inaxes != self.ax or self.current_freqs_mhz is None:
             return
         
         if event.button == 3:
             self.zoom_dragging = True
             self.zoom_start_x = event.xdata
             self.zoom_start_y = event.ydata
+            if self.zoom_rect is None:
+                self.zoom_rect = Rectangle((0, 0), 0, 0, facecolor='cyan', alpha=0.1, edgecolor='cyan',
+                                           linewidth=2, animated=True)
+                self.ax.add_patch(self.zoom_rect)
+            self.zoom_rect.set_bounds(event.xdata, event.ydata, 0, 0)
+            self.zoom_rect.set_visible(True)
         else:
             self.dragging = True
             self._update_marker(event.xdata)
     
     def _on_motion(self, event):
-        if event.inaxes != self.ax or self.current_freqs is None or event.xdata is None:
+        if event.inaxes != self.ax or self.current_freqs_mhz is None or event.xdata is None:
             return
         
         if self.zoom_dragging and self.zoom_start_x is not None and event.ydata is not None:
-            if self.zoom_rect is not None:
-                self.zoom_rect.remove()
-            
-            x_min = min(self.zoom_start_x, event.xdata)
-            x_max = max(self.zoom_start_x, event.xdata)
-            y_min = min(self.zoom_start_y, event.ydata)
-            y_max = max(self.zoom_start_y, event.ydata)
-            
-            self.zoom_rect = Rectangle((x_min, y_min), x_max - x_min, y_max - y_min,
-                                       facecolor='cyan', alpha=0.1, edgecolor='cyan', linewidth=2)
-            self.ax.add_patch(self.zoom_rect)
-            self.canvas.draw_idle()
+            self.zoom_rect.set_bounds(min(self.zoom_start_x, event.xdata), min(self.zoom_start_y, event.ydata),
+                                      abs(event.xdata - self.zoom_start_x), abs(event.ydata - self.zoom_start_y))
+            self._blit()
         elif self.dragging:
             self._update_marker(event.xdata)
     
@@ -581,6 +723,8 @@ class SpectrumPlot(ctk.CTkFrame):
             y_min = min(self.zoom_start_y, event.ydata)
             y_max = max(self.zoom_start_y, event.ydata)
             
+            self.zoom_rect.set_visible(False)
+            
             if abs(x_max - x_min) > 0.01:
                 if self.original_xlim is None:
                     self.original_xlim = self.ax.get_xlim()
@@ -590,11 +734,10 @@ class SpectrumPlot(ctk.CTkFrame):
                 self.zoom_history.append((self.ax.get_xlim(), self.ax.get_ylim()))
                 self.ax.set_xlim(x_min, x_max)
                 self.ax.set_ylim(y_min, y_max)
+                self._refresh_lines()
                 self.canvas.draw()
-            
-            if self.zoom_rect is not None:
-                self.zoom_rect.remove()
-                self.zoom_rect = None
+            else:
+                self._blit()
             
             self.zoom_dragging = False
             self.zoom_start_x = None
@@ -602,15 +745,19 @@ class SpectrumPlot(ctk.CTkFrame):
         else:
             self.dragging = False
     
-    def _update_marker(self, x_pos):
-        if self.current_freqs is None or self.current_vals is None:
+    def _update_marker(self, x_pos, redraw=True):
+        if self.current_freqs_mhz is None or self.current_vals is None:
             return
         
-        if x_pos < self.current_freqs[0] or x_pos > self.current_freqs[-1]:
+        if x_pos < self.current_freqs_mhz[0] or x_pos > self.current_freqs_mhz[-1]:
             return
         
-        idx = np.argmin(np.abs(self.current_freqs - x_pos))
-        freq = self.current_freqs[idx]
+        idx = _nearest_index(self.current_freqs_mhz, x_pos)
+        self._marker_idx = idx
+        self._show_marker(idx, redraw)
+    
+    def _show_marker(self, idx, redraw=True):
+        freq = self.current_freqs_mhz[idx]
         val = self.current_vals[idx]
         max_val = self.current_max_vals[idx] if self.current_max_vals is not None else None
         
@@ -618,14 +765,15 @@ class SpectrumPlot(ctk.CTkFrame):
         
         if self.marker_line is None:
             self.marker_line = self.ax.axvline(
-                x=freq, color="#ff00ff", linewidth=1.5, linestyle="-", alpha=0.8
+                x=freq, color="#ff00ff", linewidth=1.5, linestyle="-", alpha=0.8, animated=True
             )
         else:
             self.marker_line.set_xdata([freq, freq])
         
         if self.marker_dot is None:
             (self.marker_dot,) = self.ax.plot(
-                freq, val, 'o', color="#ff00ff", markersize=10, zorder=10, markeredgewidth=2, markeredgecolor="#ff66ff"
+                freq, val, 'o', color="#ff00ff", markersize=10, zorder=10, markeredgewidth=2, markeredgecolor="#ff66ff",
+                animated=True
             )
         else:
             self.marker_dot.set_data([freq], [val])
@@ -642,56 +790,93 @@ class SpectrumPlot(ctk.CTkFrame):
         if self.on_marker_update:
             self.on_marker_update(freq, val, max_val)
         
-        self.canvas.draw_idle()
+        if redraw:
+            self._blit()
     
     def update_data(self, freqs_mhz, vals, max_freqs_mhz=None, max_vals=None):
-        self.current_freqs = freqs_mhz.copy()
-        self.current_vals = vals.copy()
-        self.current_max_vals = max_vals.copy() if max_vals is not None else None
-        
-        current_freq_range = (float(freqs_mhz[0]), float(freqs_mhz[-1]))
-        freq_range_changed = (self.previous_freq_range is not None and 
-                              (abs(self.previous_freq_range[0] - current_freq_range[0]) > 0.1 or
-                               abs(self.previous_freq_range[1] - current_freq_range[1]) > 0.1))
-        
-        if freq_range_changed:
+        """Queue a new sweep for display, coalescing updates to at most MAX_REDRAW_HZ redraws per second.
+        
+        The arrays are kept by reference, so callers must hand over fresh per-sweep
+        arrays and not modify them afterwards. The exception is the peak-hold
+        buffer, which the viewer rewrites in place on the main thread and which
+        therefore always holds the latest sweep's values.
+        """
+        self._pending_data = (freqs_mhz, vals, max_freqs_mhz, max_vals)
+        if not self._redraw_scheduled:
+            self._redraw_scheduled = True
+            self.after(self._min_interval_ms, self._flush_redraw)
+    
+    def _flush_redraw(self):
+        self._redraw_scheduled = False
+        if self._pending_data is None:
+            return
+        freqs_mhz, vals, max_freqs_mhz, max_vals = self._pending_data
+        self._pending_data = None
+        
+        f0 = freqs_mhz[0].item()
+        f1 = freqs_mhz[-1].item()
+        # Compared exactly: spans far below 0.1 MHz are valid, so any move of the
+        # endpoints or point count means the lines need new x data
+        axis = (len(freqs_mhz), f0, f1)
+        prev_axis, self._line_axis = self._line_axis, axis
+        same_axis = axis == prev_axis
+        # First frame or moved endpoints: the x limits follow and the zoom state is stale
+        new_range = prev_axis is None or prev_axis[1:] != axis[1:]
+        if not same_axis:
+            self._marker_idx = None
+        self.current_freqs_mhz = freqs_mhz
+        self.current_vals = vals
+        self.current_max_vals = max_vals
+        
+        if new_range:
             self.zoom_history = []
             self.original_xlim = None
             self.original_ylim = None
         
-        self.previous_freq_range = current_freq_range
+        full_redraw = new_range
         
+        x, y = self._display_data(freqs_mhz, vals)
         if self.line_current is None:
             (self.line_current,) = self.ax.plot(
-                freqs_mhz, vals, 
+                x, y, 
                 color="#00ff88", 
                 linewidth=2.5, 
                 label="Current",
-                alpha=0.95
+                alpha=0.95,
+                animated=True
             )
+            full_redraw = True
+        elif same_axis and len(self.line_current.get_xdata()) == len(y):
+            # Frequency axis unchanged between sweeps: only the amplitudes move
+            self.line_current.set_ydata(y)
         else:
-            self.line_current.set_data(freqs_mhz, vals)
+            self.line_current.set_data(x, y)
         
         if max_vals is not None and max_freqs_mhz is not None:
+            x, y = self._display_data(max_freqs_mhz, max_vals)
             if self.line_max is None:
                 (self.line_max,) = self.ax.plot(
-                    max_freqs_mhz, max_vals,
+                    x, y,
                     color="#ffff00",
                     linewidth=2.0,
                     label="Max Hold",
-                    alpha=0.85
+                    alpha=0.85,
+                    animated=True
                 )
+                full_redraw = True
+            elif same_axis and len(self.line_max.get_xdata()) == len(y):
+                self.line_max.set_ydata(y)
             else:
-                self.line_max.set_data(max_freqs_mhz, max_vals)
+                self.line_max.set_data(x, y)
         
-        if freq_range_changed:
-            self.ax.set_xlim(current_freq_range[0], current_freq_range[1])
-        else:
-            self.ax.relim()
-            self.ax.autoscale_view(scalex=True, scaley=False)
+        # The x limits only move with the frequency range and the y limits are fixed,
+        # so no relim/autoscale pass over the line data is needed
+        if new_range:
+            self.ax.set_xlim(f0, f1)
         
-        self.ax.set_ylim(YMIN_DBM, YMAX_DBM)
-        self.canvas.draw_idle()
+        if self.ax.get_ylim() != (YMIN_DBM, YMAX_DBM):
+            self.ax.set_ylim(YMIN_DBM, YMAX_DBM)
+            full_redraw = True
         
         if not self.ax.get_legend():
             legend = self.ax.legend(
@@ -704,18 +889,29 @@ class SpectrumPlot(ctk.CTkFrame):
                 fancybox=True
             )
             legend.get_frame().set_linewidth(1.5)
-        
-        if self.marker_x is not None:
-            self._update_marker(self.marker_x)
-        
-        self.canvas.draw()
+            full_redraw = True
+        
+        # Marker is repainted together with the traces below
+        if self._marker_idx is not None:
+            # Same frequency axis as last sweep: the marker sits on the same sample
+            self._show_marker(self._marker_idx, redraw=False)
+        elif self.marker_x is not None:
+            self._update_marker(self.marker_x, redraw=False)
+        
+        if full_redraw:
+            # Axis limits or legend changed: rebuild the cached background on the next
+            # idle cycle (coalescing with any resize draw) and stop blitting the stale one
+            self._bg = None
+            self.canvas.draw_idle()
+        else:
+            self._blit()
     
     def _save_csv(self):
         if self.get_is_continuous and self.get_is_continuous():
             messagebox.showwarning("Continuous Sweep Active", "Cannot save data while continuous sweep is running.\nStop the sweep first.")
             return
         
-        if self.current_freqs is None or self.current_vals is None:
+        if self.current_freqs_mhz is None or self.current_vals is None:
             messagebox.showwarning("No Data", "No spectrum data to save. Run a sweep first.")
             return
         
@@ -729,39 +925,31 @@ class SpectrumPlot(ctk.CTkFrame):
         if not file:
             return
         
-        try:
-            freqs_mhz = self.current_freqs / 1e6
-            with open(file, 'w', newline='') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(["Frequency (MHz)", "Amplitude (dBm)"])
-                if self.current_max_vals is not None:
-                    writer.writerow(["", ""])
-                    writer.writerow(["Frequency (MHz)", "Peak Hold (dBm)"])
-                    for freq, amp in zip(freqs_mhz, self.current_max_vals):
-                        writer.writerow([f"{freq:.6f}", f"{amp:.2f}"])
-                else:
-                    for freq, amp in zip(freqs_mhz, self.current_vals):
-                        writer.writerow([f"{freq:.6f}", f"{amp:.2f}"])
-            messagebox.showinfo("Success", f"Data saved to:\n{file}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save CSV:\n{str(e)}")
+        self._run_export(self._write_csv, file, "CSV")
+    
+    @staticmethod
+    def _write_csv(file, table):
+        with open(file, 'w', newline='', buffering=1024 * 1024) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["Frequency (MHz)", "Amplitude (dBm)"])
+            np.savetxt(csvfile, table[:, :2], fmt=["%.6f", "%.2f"], delimiter=",", newline="\r\n")
+            if table.shape[1] > 2:
+                writer.writerow(["", ""])
+                writer.writerow(["Frequency (MHz)", "Peak Hold (dBm)"])
+                # Columns 0 and 2 as a strided view, no copy
+                np.savetxt(csvfile, table[:, ::2], fmt=["%.6f", "%.2f"], delimiter=",", newline="\r\n")
+            csvfile.flush()
+            os.fsync(csvfile.fileno())
     
     def _save_excel(self):
         if self.get_is_continuous and self.get_is_continuous():
             messagebox.showwarning("Continuous Sweep Active", "Cannot save data while continuous sweep is running.\nStop the sweep first.")
             return
         
-        if self.current_freqs is None or self.current_vals is None:
+        if self.current_freqs_mhz is None or self.current_vals is None:
             messagebox.showwarning("No Data", "No spectrum data to save. Run a sweep first.")
             return
         
-        try:
-            import openpyxl
-            from openpyxl.styles import Font, PatternFill, Alignment
-        except ImportError:
-            messagebox.showerror("Missing Package", "openpyxl is required for Excel export.\nInstalling...")
-            return
-        
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         file = filedialog.asksaveasfilename(
             defaultextension=".xlsx",
@@ -772,60 +960,89 @@ class SpectrumPlot(ctk.CTkFrame):
         if not file:
             return
         
-        try:
-            from openpyxl.styles import Font, PatternFill, Alignment
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "Spectrum Data"
-            
-            header_fill = PatternFill(start_color="1a1a2e", end_color="1a1a2e", fill_type="solid")
-            header_font = Font(bold=True, color="00d4ff")
-            
-            ws['A1'] = "Frequency (MHz)"
-            ws['B1'] = "Amplitude (dBm)"
-            ws['A1'].fill = header_fill
-            ws['B1'].fill = header_fill
-            ws['A1'].font = header_font
-            ws['B1'].font = header_font
-            
-            freqs_mhz = self.current_freqs / 1e6
-            for idx, (freq, amp) in enumerate(zip(freqs_mhz, self.current_vals), start=2):
-                ws[f'A{idx}'] = f"{freq:.6f}"
-                ws[f'B{idx}'] = f"{amp:.2f}"
-            
-            if self.current_max_vals is not None:
-                row = len(freqs_mhz) + 4
-                ws[f'A{row}'] = "Frequency (MHz)"
-                ws[f'B{row}'] = "Peak Hold (dBm)"
-                ws[f'A{row}'].fill = header_fill
-                ws[f'B{row}'].fill = header_fill
-                ws[f'A{row}'].font = header_font
-                ws[f'B{row}'].font = header_font
+        self._run_export(self._write_excel, file, "Excel")
+    
+    @staticmethod
+    def _write_excel(file, table):
+        """Write a minimal .xlsx package directly, streaming the sheet XML into the zip"""
+        freqs_mhz = table[:, 0]
+        blocks = [("Amplitude (dBm)", table[:, 1])]
+        if table.shape[1] > 2:
+            blocks.append(("Peak Hold (dBm)", table[:, 2]))
+        
+        with open(file, 'wb', buffering=1024 * 1024) as fh:
+            with zipfile.ZipFile(fh, 'w', zipfile.ZIP_DEFLATED) as zf:
+                zf.writestr("[Content_Types].xml", XLSX_CONTENT_TYPES)
+                zf.writestr("_rels/.rels", XLSX_ROOT_RELS)
+                zf.writestr("xl/workbook.xml", XLSX_WORKBOOK)
+                zf.writestr("xl/_rels/workbook.xml.rels", XLSX_WORKBOOK_RELS)
+                zf.writestr("xl/styles.xml", XLSX_STYLES)
                 
-                for idx, (freq, amp) in enumerate(zip(freqs_mhz, self.current_max_vals), start=row+1):
-                    ws[f'A{idx}'] = f"{freq:.6f}"
-                    ws[f'B{idx}'] = f"{amp:.2f}"
-            
-            ws.column_dimensions['A'].width = 18
-            ws.column_dimensions['B'].width = 18
-            
-            wb.save(file)
-            messagebox.showinfo("Success", f"Data saved to:\n{file}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save Excel:\n{str(e)}")
+                with zf.open("xl/worksheets/sheet1.xml", 'w') as sheet:
+                    sheet.write(XLSX_SHEET_HEAD)
+                    row = 1
+                    for title, amps in blocks:
+                        # Header cells use style 1 (bold cyan on dark fill)
+                        sheet.write(
+                            f'<row r="{row}"><c r="A{row}" s="1" t="inlineStr"><is><t>Frequency (MHz)</t></is></c>'
+                            f'<c r="B{row}" s="1" t="inlineStr"><is><t>{title}</t></is></c></row>'.encode()
+                        )
+                        # Format the whole block with one %-operation over the interleaved
+                        # (row, freq, amp) values instead of a Python loop per row
+                        row_nums = np.arange(row + 1, row + 1 + len(amps))
+                        values = np.column_stack((row_nums, freqs_mhz, amps)).ravel().tolist()
+                        sheet.write(((XLSX_DATA_ROW * len(amps)) % tuple(values)).encode())
+                        # Two blank rows before the next block
+                        row += len(amps) + 3
+                    sheet.write(XLSX_SHEET_TAIL)
+            # Central directory is written on ZipFile close; sync once after that
+            fh.flush()
+            os.fsync(fh.fileno())
+    
+    def _run_export(self, write, file, kind):
+        """Write a snapshot of the current traces on a worker thread to keep the GUI responsive"""
+        # One row-major (N, 2|3) snapshot: frequency, amplitude and, if present, peak hold.
+        # Frequencies stay float64 so the 6-decimal MHz export keeps Hz resolution.
+        columns = [self.current_freqs_mhz, self.current_vals]
+        if self.current_max_vals is not None:
+            columns.append(self.current_max_vals)
+        table = np.column_stack(columns)
+        
+        def do_export():
+            try:
+                write(file, table)
+                self.after(0, lambda: messagebox.showinfo("Success", f"Data saved to:\n{file}"))
+            except Exception as e:
+                error_msg = str(e)
+                self.after(0, lambda msg=error_msg: messagebox.showerror("Error", f"Failed to save {kind}:\n{msg}"))
+        
+        thread = threading.Thread(target=do_export, daemon=True)
+        thread.start()
     
     def _reset_zoom(self):
         if self.original_xlim is not None:
             self.ax.set_xlim(self.original_xlim)
         else:
-            if self.current_freqs is not None:
-                self.ax.set_xlim(self.current_freqs[0], self.current_freqs[-1])
+            if self.current_freqs_mhz is not None:
+                self.ax.set_xlim(self.current_freqs_mhz[0], self.current_freqs_mhz[-1])
         self.ax.set_ylim(YMIN_DBM, YMAX_DBM)
         self.zoom_history = []
         self.original_xlim = None
         self.original_ylim = None
+        self._refresh_lines()
         self.canvas.draw()
     
+    def clear_max_hold(self):
+        """Remove the peak-hold trace; it is an animated artist, so a blit erases it"""
+        if self._pending_data is not None:
+            freqs_mhz, vals, _, _ = self._pending_data
+            self._pending_data = (freqs_mhz, vals, None, None)
+        self.current_max_vals = None
+        if self.line_max is not None:
+            self.line_max.remove()
+            self.line_max = None
+            self._blit()
+    
     def clear(self):
         self.ax.clear()
         self._style_axis()
@@ -833,15 +1050,17 @@ class SpectrumPlot(ctk.CTkFrame):
         self.line_max = None
         self.marker_line = None
         self.marker_dot = None
-        self.marker_annotation = None
         self.marker_x = None
-        self.current_freqs = None
+        self._marker_idx = None
+        self.zoom_rect = None
+        self.current_freqs_mhz = None
         self.current_vals = None
         self.current_max_vals = None
-        self.previous_freq_range = None
+        self._line_axis = None
         self.zoom_history = []
         self.original_xlim = None
         self.original_ylim = None
+        self._pending_data = None
         self.marker_label.configure(
             text="Click on the spectrum to place a marker",
             text_color="#888888"
@@ -849,6 +1068,37 @@ class SpectrumPlot(ctk.CTkFrame):
         self.canvas.draw()
 
 
+class SaChannel:
+    """Connection, sweep and peak-hold state of one analyzer"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.panel = None
+        self.plot = None
+        # Only assigned on the Tk thread; workers just read it
+        self.inst = None
+        self.connecting = False
+        self.continuous = False
+        self.stop = threading.Event()
+        
+        # Last applied (start, stop, points, RBW, VBW) and the frequency axis it produced
+        self.last_cfg = None
+        self.freqs = None
+        
+        # Latest continuous frame and whether a drain is already queued on the Tk loop;
+        # both guarded by the viewer's _frame_lock
+        self.latest = None
+        self.pending = False
+        
+        self.max_vals = None
+        self.max_freqs = None
+        
+        # MHz copy of the trace axis (shared by the peak-hold line), replaced when the axis
+        # changes; freqs_src is the Hz array freqs_mhz was last converted from
+        self.freqs_src = None
+        self.freqs_mhz = None
+
+
 class DualSAViewer(ctk.CTk):
     """Main application window for Dual Spectrum Analyzer Viewer"""
     
@@ -860,24 +1110,23 @@ class DualSAViewer(ctk.CTk):
         self.minsize(1000, 700)
         
         self.rm = None
-        self.inst1 = None
-        self.inst2 = None
-        
-        self.max_vals1 = None
-        self.max_freqs1 = None
-        self.max_vals2 = None
-        self.max_freqs2 = None
+        self._rm_lock = threading.Lock()
+        # Bumped by _reset_network so connects started before the reset are discarded
+        self._net_gen = 0
+        self.ch1 = SaChannel("SA1")
+        self.ch2 = SaChannel("SA2")
         
-        self.continuous1 = False
-        self.continuous2 = False
-        self.sweep_thread1 = None
-        self.sweep_thread2 = None
+        self._frame_lock = threading.Lock()
         
         self.fullscreen_mode = None
         
         self.protocol("WM_DELETE_WINDOW", self._on_closing)
         
         self._build_ui()
+        
+        # pyvisa and its backend are only needed on connect; load them while the user fills in the IPs
+        self._visa_preload = threading.Thread(target=self._preload_visa, daemon=True)
+        self._visa_preload.start()
     
     def _build_ui(self):
         self.configure(fg_color="#0a0a1a")
@@ -996,23 +1245,25 @@ class DualSAViewer(ctk.CTk):
             left_control,
             title="Spectrum Analyzer 1",
             default_ip=DEFAULT_IP1,
-            on_connect=self.connect1,
-            on_sweep=self.sweep1,
-            on_reset=self.reset_peak1,
-            on_continuous_toggle=self.toggle_continuous1
+            on_connect=lambda ip: self.connect(self.ch1, ip),
+            on_sweep=lambda: self.sweep(self.ch1),
+            on_reset=lambda: self.reset_peak(self.ch1),
+            on_continuous_toggle=lambda: self.toggle_continuous(self.ch1)
         )
         self.sa1_panel.pack(fill="x")
+        self.ch1.panel = self.sa1_panel
         
         self.sa2_panel = SpectrumAnalyzerPanel(
             right_control,
             title="Spectrum Analyzer 2",
             default_ip=DEFAULT_IP2,
-            on_connect=self.connect2,
-            on_sweep=self.sweep2,
-            on_reset=self.reset_peak2,
-            on_continuous_toggle=self.toggle_continuous2
+            on_connect=lambda ip: self.connect(self.ch2, ip),
+            on_sweep=lambda: self.sweep(self.ch2),
+            on_reset=lambda: self.reset_peak(self.ch2),
+            on_continuous_toggle=lambda: self.toggle_continuous(self.ch2)
         )
         self.sa2_panel.pack(fill="x")
+        self.ch2.panel = self.sa2_panel
         
         self.plots_frame = ctk.CTkFrame(main_container, fg_color="transparent")
         self.plots_frame.pack(fill="both", expand=True)
@@ -1020,8 +1271,9 @@ class DualSAViewer(ctk.CTk):
         self.plot1_frame = ctk.CTkFrame(self.plots_frame, fg_color="transparent")
         self.plot1_frame.pack(fill="both", expand=True, pady=(0, 3))
         
-        self.plot1 = SpectrumPlot(self.plot1_frame, title="SA1 Spectrum", on_marker_update=self._update_sa1_marker, get_is_continuous=lambda: self.continuous1)
+        self.plot1 = SpectrumPlot(self.plot1_frame, title="SA1 Spectrum", on_marker_update=self._update_sa1_marker, get_is_continuous=lambda: self.ch1.continuous)
         self.plot1.pack(fill="both", expand=True)
+        self.ch1.plot = self.plot1
         
         divider = ctk.CTkFrame(self.plots_frame, fg_color="#333366", height=6)
         divider.pack(fill="x", padx=0, pady=1)
@@ -1033,12 +1285,15 @@ class DualSAViewer(ctk.CTk):
         self.divider = divider
         self.divider_dragging = False
         self.divider_start_y = 0
+        self._divider_delta = 0
+        self._divider_after_id = None
         
         self.plot2_frame = ctk.CTkFrame(self.plots_frame, fg_color="transparent")
         self.plot2_frame.pack(fill="both", expand=True, pady=(3, 0))
         
-        self.plot2 = SpectrumPlot(self.plot2_frame, title="SA2 Spectrum", on_marker_update=self._update_sa2_marker, get_is_continuous=lambda: self.continuous2)
+        self.plot2 = SpectrumPlot(self.plot2_frame, title="SA2 Spectrum", on_marker_update=self._update_sa2_marker, get_is_continuous=lambda: self.ch2.continuous)
         self.plot2.pack(fill="both", expand=True)
+        self.ch2.plot = self.plot2
         
         footer = ctk.CTkFrame(self, fg_color="#16213e", corner_radius=0, height=40)
         footer.pack(fill="x", side="bottom")
@@ -1120,6 +1375,19 @@ class DualSAViewer(ctk.CTk):
         
         self.divider_start_y = event.y_root
         
+        # Motion events arrive far faster than the plots can relayout; accumulate the
+        # movement and apply it at most once per ~16 ms frame
+        self._divider_delta += delta
+        if self._divider_after_id is None:
+            self._divider_after_id = self.after(16, self._apply_divider_resize)
+    
+    def _apply_divider_resize(self):
+        self._divider_after_id = None
+        delta = self._divider_delta
+        self._divider_delta = 0
+        if delta == 0 or self.fullscreen_mode is not None:
+            return
+        
         try:
             plot1_height = self.plot1_frame.winfo_height()
             plot2_height = self.plot2_frame.winfo_height()
@@ -1150,24 +1418,20 @@ class DualSAViewer(ctk.CTk):
     
     def _reset_network(self):
         print("Resetting VISA resource manager...")
-        self.continuous1 = False
-        self.continuous2 = False
-        self.sa1_panel.set_continuous_active(False)
-        self.sa2_panel.set_continuous_active(False)
-        
-        try:
-            if self.inst1 is not None:
-                self.inst1.close()
-            self.inst1 = None
-        except:
-            pass
-        
-        try:
-            if self.inst2 is not None:
-                self.inst2.close()
-            self.inst2 = None
-        except:
-            pass
+        self._net_gen += 1
+        for ch in (self.ch1, self.ch2):
+            ch.connecting = False
+            ch.continuous = False
+            ch.stop.set()
+            ch.panel.set_continuous_active(False)
+        
+        for ch in (self.ch1, self.ch2):
+            try:
+                if ch.inst is not None:
+                    ch.inst.close()
+                ch.inst = None
+            except:
+                pass
         
         try:
             if self.rm is not None:
@@ -1176,18 +1440,30 @@ class DualSAViewer(ctk.CTk):
         except:
             pass
         
-        self.sa1_panel.set_connected(False)
-        self.sa2_panel.set_connected(False)
-        self.sa1_panel.set_message("Network reset - ready to reconnect")
-        self.sa2_panel.set_message("Network reset - ready to reconnect")
-        self.plot1.clear()
-        self.plot2.clear()
-        self.max_vals1 = None
-        self.max_freqs1 = None
-        self.max_vals2 = None
-        self.max_freqs2 = None
+        for ch in (self.ch1, self.ch2):
+            ch.panel.set_connected(False)
+            ch.panel.set_message("Network reset - ready to reconnect")
+            self._forget_traces(ch)
         print("Network reset complete")
     
+    def _forget_traces(self, ch):
+        """Clear the channel's plot, peak hold, queued frame and cached configuration"""
+        with self._frame_lock:
+            ch.latest = None
+        ch.plot.clear()
+        ch.max_vals = None
+        ch.max_freqs = None
+        ch.last_cfg = None
+        ch.freqs = None
+    
+    def _drain(self, ch):
+        """Render the channel's newest frame; the peaks of frames it replaced are folded into it"""
+        with self._frame_lock:
+            frame, ch.latest = ch.latest, None
+            ch.pending = False
+        if frame is not None:
+            self._update_plot(ch, *frame)
+    
     def _update_sa1_marker(self, freq, val, max_val):
         if max_val is not None:
             text = f"SA1: {freq:.2f} MHz | {val:.1f} dBm (Max: {max_val:.1f})"
@@ -1204,25 +1480,20 @@ class DualSAViewer(ctk.CTk):
     
 
     def _on_closing(self):
-        self.continuous1 = False
-        self.continuous2 = False
+        for ch in (self.ch1, self.ch2):
+            ch.continuous = False
+            ch.stop.set()
         
         self.footer_text.configure(text="Closing connections...")
         self.update()
         
-        if self.inst1 is not None:
-            try:
-                self.inst1.close()
-            except:
-                pass
-            self.inst1 = None
-        
-        if self.inst2 is not None:
-            try:
-                self.inst2.close()
-            except:
-                pass
-            self.inst2 = None
+        for ch in (self.ch1, self.ch2):
+            if ch.inst is not None:
+                try:
+                    ch.inst.close()
+                except:
+                    pass
+                ch.inst = None
         
         if self.rm is not None:
             try:
@@ -1234,123 +1505,112 @@ class DualSAViewer(ctk.CTk):
         self.destroy()
     
     def _get_rm(self):
-        if self.rm is None:
-            self.rm = pyvisa.ResourceManager("@py")
-        return self.rm
+        with self._rm_lock:
+            if self.rm is None:
+                import pyvisa
+                self.rm = pyvisa.ResourceManager("@py")
+            return self.rm
     
-    def _check_connection1(self):
-        if self.inst1 is None:
-            return False
+    def _preload_visa(self):
+        """Import pyvisa and create the @py resource manager before the first connect"""
         try:
-            self.inst1.write("*OPC?")
-            time.sleep(0.1)
-            response = self.inst1.read()
-            return "1" in response
+            self._get_rm()
         except Exception as e:
-            print(f"SA1 connection check failed: {e}")
-            return False
+            print(f"VISA preload failed: {e}")
     
-    def _check_connection2(self):
-        if self.inst2 is None:
-            return False
+    def _open_instrument(self, rm, ip: str):
+        """Open the raw SCPI socket with Nagle disabled, falling back to VXI-11 if it is refused"""
+        try:
+            inst = rm.open_resource(f"TCPIP0::{ip}::{SCPI_SOCKET_PORT}::SOCKET")
+        except Exception as e:
+            print(f"Socket connection to {ip} failed ({e}), falling back to VXI-11...")
+            return rm.open_resource(f"TCPIP::{ip}::INSTR")
+        
+        inst.read_termination = "\n"
+        inst.write_termination = "\n"
         try:
-            self.inst2.write("*OPC?")
-            time.sleep(0.1)
-            response = self.inst2.read()
-            return "1" in response
+            sock = inst.visalib.sessions[inst.session].interface
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
         except Exception as e:
-            print(f"SA2 connection check failed: {e}")
-            return False
+            print(f"Could not disable Nagle on {ip}: {e}")
+        return inst
     
-    def connect1(self, ip: str):
+    def connect(self, ch, ip: str):
         if not ip:
-            messagebox.showerror("SA1 Error", "Please enter a valid IP address")
+            messagebox.showerror(f"{ch.name} Error", "Please enter a valid IP address")
             return
         
-        if self.inst1 is not None:
-            self.continuous1 = False
-            self.sa1_panel.set_continuous_active(False)
+        if ch.inst is not None:
+            ch.continuous = False
+            ch.stop.set()
+            ch.panel.set_continuous_active(False)
             try:
-                self.inst1.close()
+                ch.inst.close()
             except:
                 pass
-            self.inst1 = None
-            self.sa1_panel.set_connected(False)
-            self.sa1_panel.set_message("Disconnected")
-            self.max_vals1 = None
-            self.max_freqs1 = None
-            self.plot1.clear()
+            ch.inst = None
+            ch.panel.set_connected(False)
+            ch.panel.set_message("Disconnected")
+            self._forget_traces(ch)
             return
         
+        if ch.connecting:
+            return
+        ch.connecting = True
+        ch.panel.set_message("Connecting...")
+        thread = threading.Thread(target=self._do_connect, args=(ch, ip, self._net_gen), daemon=True)
+        thread.start()
+    
+    def _do_connect(self, ch, ip: str, gen: int):
+        inst = None
         try:
-            print(f"SA1: Attempting to connect to {ip}...")
+            print(f"{ch.name}: Attempting to connect to {ip}...")
             rm = self._get_rm()
-            print(f"SA1: Resource manager created, opening resource...")
-            self.inst1 = rm.open_resource(f"TCPIP::{ip}::INSTR")
-            print(f"SA1: Resource opened, setting timeout to 120000ms...")
-            self.inst1.timeout = 120000
-            print(f"SA1: Waiting for device to stabilize...")
+            print(f"{ch.name}: Resource manager created, opening resource...")
+            inst = self._open_instrument(rm, ip)
+            print(f"{ch.name}: Resource opened, setting timeout to 120000ms...")
+            inst.timeout = 120000
+            print(f"{ch.name}: Waiting for device to stabilize...")
             time.sleep(2)
-            print(f"SA1: Querying device ID...")
-            self.inst1.write("*IDN?")
-            time.sleep(0.5)
-            idn = self.inst1.read().strip()
-            print(f"SA1: Device ID: {idn}")
-            self.sa1_panel.set_connected(True, idn)
-            self.sa1_panel.set_message("Connected successfully")
+            print(f"{ch.name}: Querying device ID...")
+            idn = inst.query("*IDN?").strip()
+            print(f"{ch.name}: Device ID: {idn}")
+            # Handed over on the Tk thread, where _reset_network also runs
+            self.after(0, self._on_connected, ch, inst, idn, gen)
         except Exception as e:
             error_str = f"{type(e).__name__}: {str(e)}"
-            print(f"SA1 Connection Error: {error_str}")
-            self.inst1 = None
-            self.sa1_panel.set_connected(False)
-            self.sa1_panel.set_message(f"Connection failed", is_error=True)
-            messagebox.showerror("SA1 Error", error_str)
+            print(f"{ch.name} Connection Error: {error_str}")
+            if inst is not None:
+                try:
+                    inst.close()
+                except:
+                    pass
+            self.after(0, self._on_connect_failed, ch, error_str, gen)
     
-    def connect2(self, ip: str):
-        if not ip:
-            messagebox.showerror("SA2 Error", "Please enter a valid IP address")
-            return
-        
-        if self.inst2 is not None:
-            self.continuous2 = False
-            self.sa2_panel.set_continuous_active(False)
+    def _on_connected(self, ch, inst, idn, gen):
+        if gen != self._net_gen:
+            # The network was reset while connecting; the session belongs to the closed manager
+            print(f"{ch.name}: Discarding connection opened before the network reset")
             try:
-                self.inst2.close()
+                inst.close()
             except:
                 pass
-            self.inst2 = None
-            self.sa2_panel.set_connected(False)
-            self.sa2_panel.set_message("Disconnected")
-            self.max_vals2 = None
-            self.max_freqs2 = None
-            self.plot2.clear()
             return
-        
-        try:
-            print(f"SA2: Attempting to connect to {ip}...")
-            rm = self._get_rm()
-            print(f"SA2: Resource manager created, opening resource...")
-            self.inst2 = rm.open_resource(f"TCPIP::{ip}::INSTR")
-            print(f"SA2: Resource opened, setting timeout to 120000ms...")
-            self.inst2.timeout = 120000
-            print(f"SA2: Waiting for device to stabilize...")
-            time.sleep(2)
-            print(f"SA2: Querying device ID...")
-            self.inst2.write("*IDN?")
-            time.sleep(0.5)
-            idn = self.inst2.read().strip()
-            print(f"SA2: Device ID: {idn}")
-            self.sa2_panel.set_connected(True, idn)
-            self.sa2_panel.set_message("Connected successfully")
-        except Exception as e:
-            error_str = f"{type(e).__name__}: {str(e)}"
-            print(f"SA2 Connection Error: {error_str}")
-            self.inst2 = None
-            self.sa2_panel.set_connected(False)
-            self.sa2_panel.set_message(f"Connection failed", is_error=True)
-            messagebox.showerror("SA2 Error", error_str)
+        ch.connecting = False
+        ch.inst = inst
+        ch.panel.set_connected(True, idn)
+        ch.panel.set_message("Connected successfully")
+    
+    def _on_connect_failed(self, ch, error_str, gen):
+        if gen != self._net_gen:
+            return
+        ch.connecting = False
+        ch.panel.set_connected(False)
+        ch.panel.set_message(f"Connection failed", is_error=True)
+        messagebox.showerror(f"{ch.name} Error", error_str)
     
     def _configure_sa(self, inst, start_mhz, stop_mhz, points=3001, bw_res="10k", bw_vid="10k"):
+        """Apply the sweep settings and return the resulting frequency axis in Hz, or None on failure"""
         start_hz = start_mhz * 1e6
         stop_hz = stop_mhz * 1e6
         center_hz = (start_hz + stop_hz) / 2
@@ -1358,74 +1618,91 @@ class DualSAViewer(ctk.CTk):
         
         try:
             if bw_res == "auto":
-                inst.write(":BAND:RES:AUTO ON")
+                commands = [":BAND:RES:AUTO ON"]
             else:
                 bw_res_hz = float(bw_res.replace('k', 'e3').replace('M', 'e6'))
-                inst.write(f":BAND:RES {bw_res_hz}")
+                commands = [f":BAND:RES {bw_res_hz}"]
             
             bw_vid_hz = float(bw_vid.replace('k', 'e3').replace('M', 'e6'))
             
-            inst.write(f":FREQ:STAR {start_hz}")
-            time.sleep(0.1)
-            inst.write(f":FREQ:STOP {stop_hz}")
-            time.sleep(0.1)
-            inst.write(f":FREQ:CENT {center_hz}")
-            time.sleep(0.1)
-            inst.write(f":FREQ:SPAN {span_hz}")
-            time.sleep(0.1)
-            inst.write(f":SWE:POIN {points}")
-            time.sleep(0.1)
-            inst.write(f":BAND:VID {bw_vid_hz}")
-            time.sleep(0.1)
-            inst.write(":DET POS")
-            time.sleep(0.1)
-            inst.write(":FORM:TRAC:DATA ASCii")
-            time.sleep(0.1)
+            commands += [
+                f":FREQ:STAR {start_hz}",
+                f":FREQ:STOP {stop_hz}",
+                f":FREQ:CENT {center_hz}",
+                f":FREQ:SPAN {span_hz}",
+                f":SWE:POIN {points}",
+                f":BAND:VID {bw_vid_hz}",
+                ":DET POS",
+                ":FORM:TRAC:DATA REAL,32",
+                ":FORM:BORD SWAP",
+                "*OPC?",
+            ]
+            # One IEEE 488.2 compound message; *OPC? returns once every setting is applied.
+            # It stays the only query in it, as some analyzers terminate each reply separately
+            inst.query(";".join(commands))
+            # Read back the axis the analyzer actually uses (it may clamp the requested one)
+            f_start, f_stop, n_points = self._read_axis(inst)
+            return np.linspace(f_start, f_stop, num=n_points)
         except Exception as e:
             print(f"Error configuring device: {e}")
+            # Drop any unread replies so they are not taken for the next trace block
+            try:
+                inst.clear()
+            except Exception:
+                pass
+            return None
+    
+    def _read_axis(self, inst):
+        """Query start (Hz), stop (Hz) and point count one at a time; some analyzers terminate each reply of a compound query separately"""
+        f_start = float(inst.query(":FREQ:STAR?"))
+        f_stop = float(inst.query(":FREQ:STOP?"))
+        points = int(float(inst.query(":SWE:POIN?")))
+        return f_start, f_stop, points
     
     def _single_sweep(self, inst):
         inst.write(":INIT:CONT OFF")
-        time.sleep(0.1)
         inst.write(":INIT")
-        try:
-            inst.write(":SWE:TIME?")
-            time.sleep(0.15)
-            st = float(inst.read())
-        except Exception:
-            st = 1.5
-        time.sleep(max(1.5, st * 1.1))
-    
-    def _read_trace_ascii_block(self, inst):
-        inst.write(":SWE:POIN?")
-        time.sleep(0.2)
-        points = int(inst.read().strip())
-        
-        inst.write(":FREQ:STAR?")
-        time.sleep(0.2)
-        f_start = float(inst.read().strip())
-        
-        inst.write(":FREQ:STOP?")
-        time.sleep(0.2)
-        f_stop = float(inst.read().strip())
-        
-        inst.write(":FORM:TRAC:DATA ASCii")
-        time.sleep(0.2)
-        inst.write(":TRAC:DATA? TRACE1")
-        time.sleep(0.3)
-        raw = inst.read().strip()
-        
-        if raw.startswith("#"):
-            n_digits = int(raw[1])
-            len_str = raw[2:2 + n_digits]
-            data_len = int(len_str)
-            header_len = 2 + n_digits
-            data_str = raw[header_len:header_len + data_len]
-        else:
-            data_str = raw
+        # *OPC? only answers once the sweep has finished, so this blocks for
+        # exactly the sweep time (bounded by inst.timeout)
+        inst.query("*OPC?")
+    
+    def _precise_wait(self, stop_event, deadline):
+        """Wait until a time.monotonic() deadline; True if stop_event was set first"""
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if stop_event.wait(remaining):
+                return True
+    
+    def _wait_sweep(self, inst, stop_event, sweep_time=0.0, poll_s=0.05):
+        """Trigger one sweep and poll the OPC bit of *ESR? until it completes; False if stop_event fires first"""
+        inst.write("*CLS;:INIT;*OPC")
+        now = time.monotonic()
+        deadline = now + inst.timeout / 1000
+        # Nothing to poll for before the expected sweep time has passed; after that the polls
+        # sit on a fixed poll_s grid, so the *ESR? round trip does not stretch the interval
+        next_poll = now + max(poll_s, sweep_time)
+        while not self._precise_wait(stop_event, next_poll):
+            if int(inst.query("*ESR?")) & 1:
+                return True
+            now = time.monotonic()
+            if now > deadline:
+                raise TimeoutError("sweep did not complete within the VISA timeout")
+            next_poll = max(next_poll + poll_s, now)
+        return False
+    
+    def _read_trace_bin(self, inst, freqs=None):
+        """Read TRACE1; pass a known frequency axis (from _configure_sa or a previous read) to skip querying it"""
+        # REAL,32 little-endian block (set up in _configure_sa); pyvisa parses the
+        # #<n><len> header and the payload lands directly in a float32 array
+        vals = inst.query_binary_values(":TRAC:DATA? TRACE1", datatype='f', is_big_endian=False,
+                                        container=np.ndarray)
+        
+        if freqs is not None and freqs.size == vals.size:
+            return freqs, vals
         
-        parts = [p for p in data_str.split(",") if p.strip()]
-        vals = np.array([float(p) for p in parts], dtype=float)
+        f_start, f_stop, points = self._read_axis(inst)
         
         if vals.size != points:
             print(f"Warning: expected {points} points, got {vals.size}")
@@ -1433,257 +1710,179 @@ class DualSAViewer(ctk.CTk):
         freqs = np.linspace(f_start, f_stop, num=vals.size)
         return freqs, vals
     
-    def reset_peak1(self):
-        self.max_vals1 = None
-        self.max_freqs1 = None
-        self.sa1_panel.set_message("Peak hold reset")
+    def _read_settings(self, ch):
+        """Snapshot the panel as (start MHz, stop MHz, points, RBW, VBW); runs on the Tk thread"""
+        start_val, stop_val = self._get_freq_range_for_panel(ch.panel)
+        pts = int(ch.panel.points_var.get())
+        return (start_val, stop_val, pts, ch.panel.bw_res_var.get(), ch.panel.bw_vid_var.get())
+    
+    def _sweep_settings(self, ch, cfg):
+        """(Re)configure the analyzer if cfg differs from the settings of the last sweep"""
+        # The analyzer keeps its settings between sweeps; only resend them on change
+        if cfg != ch.last_cfg:
+            ch.freqs = self._configure_sa(ch.inst, *cfg)
+            ch.last_cfg = cfg if ch.freqs is not None else None
     
-    def sweep1(self, center: str = None, span: str = None, points: str = None):
-        if self.inst1 is None:
-            messagebox.showerror("SA1 Error", "SA1 not connected")
+    def sweep(self, ch):
+        if ch.inst is None:
+            messagebox.showerror(f"{ch.name} Error", f"{ch.name} not connected")
             return
         
+        try:
+            cfg = self._read_settings(ch)
+        except ValueError as e:
+            messagebox.showerror(f"{ch.name} Error", f"Invalid sweep settings: {e}")
+            return
+        
+        ch.panel.set_sweeping(True)
+        
         def do_sweep():
             try:
-                start_val, stop_val = self._get_freq_range_for_panel(self.sa1_panel)
-                pts = int(self.sa1_panel.points_var.get())
-                bw_res = self.sa1_panel.bw_res_var.get()
-                bw_vid = self.sa1_panel.bw_vid_var.get()
-                
-                self.after(0, lambda: self.sa1_panel.set_sweeping(True))
-                
-                self._configure_sa(self.inst1, start_val, stop_val, pts, bw_res, bw_vid)
-                self._single_sweep(self.inst1)
-                freqs, vals = self._read_trace_ascii_block(self.inst1)
-                
-                self.after(0, lambda: self._update_plot1(freqs, vals))
-                self.after(0, lambda: self.sa1_panel.set_message("Sweep completed"))
-                self.after(0, lambda: self.sa1_panel.set_sweeping(False))
+                self._sweep_settings(ch, cfg)
+                self._single_sweep(ch.inst)
+                freqs, vals = self._read_trace_bin(ch.inst, ch.freqs)
+                self.after(0, self._on_sweep_done, ch, freqs, vals)
             except Exception as e:
-                error_msg = str(e)
-                self.after(0, lambda: self.sa1_panel.set_message("Sweep error", is_error=True))
-                self.after(0, lambda: self.sa1_panel.set_sweeping(False))
-                self.after(0, lambda msg=error_msg: messagebox.showerror("SA1 Error", msg))
+                self.after(0, self._on_sweep_error, ch, str(e))
         
         thread = threading.Thread(target=do_sweep, daemon=True)
         thread.start()
     
-    def toggle_continuous1(self):
-        if self.inst1 is None:
-            messagebox.showerror("SA1 Error", "SA1 not connected")
-            return
-        
-        self.continuous1 = not self.continuous1
-        self.sa1_panel.set_continuous_active(self.continuous1)
-        
-        if self.continuous1:
-            self._start_continuous1()
+    def _on_sweep_done(self, ch, freqs, vals):
+        self._update_plot(ch, freqs, vals)
+        ch.panel.set_message("Sweep completed")
+        ch.panel.set_sweeping(False)
+    
+    def _on_sweep_error(self, ch, error_msg):
+        ch.panel.set_message("Sweep error", is_error=True)
+        ch.panel.set_sweeping(False)
+        messagebox.showerror(f"{ch.name} Error", error_msg)
     
-    def _start_continuous1(self):
-        if not self.continuous1 or self.inst1 is None:
+    def toggle_continuous(self, ch):
+        if ch.inst is None:
+            messagebox.showerror(f"{ch.name} Error", f"{ch.name} not connected")
             return
         
-        def do_continuous():
-            sweep_count = 0
+        if not ch.continuous:
             try:
-                start_val, stop_val = self._get_freq_range_for_panel(self.sa1_panel)
-                pts = int(self.sa1_panel.points_var.get())
-                bw_res = self.sa1_panel.bw_res_var.get()
-                bw_vid = self.sa1_panel.bw_vid_var.get()
-                
-                self._configure_sa(self.inst1, start_val, stop_val, pts, bw_res, bw_vid)
-                self.inst1.write(":INIT:CONT OFF")
-                time.sleep(0.3)
-                
-                original_timeout = self.inst1.timeout
-                self.inst1.timeout = 30000
-                
-                while self.continuous1 and self.inst1 is not None:
-                    try:
-                        self.inst1.write(":INIT")
-                        self.inst1.write(":SWE:TIME?")
-                        time.sleep(0.2)
-                        try:
-                            sweep_time = float(self.inst1.read())
-                        except:
-                            sweep_time = 1.5
-                        time.sleep(max(1.5, sweep_time * 1.2))
-                        freqs, vals = self._read_trace_ascii_block(self.inst1)
-                        self.after(0, lambda f=freqs, v=vals: self._update_plot1(f, v))
-                        sweep_count += 1
-                    except Exception as sweep_err:
-                        print(f"Sweep error (sweep #{sweep_count}): {sweep_err}")
-                        time.sleep(0.5)
-                        break
-                
-                self.inst1.timeout = original_timeout
-            except Exception as e:
-                print(f"Continuous sweep setup error: {e}")
-                self.after(0, lambda: self.sa1_panel.set_message("Sweep error", is_error=True))
-            finally:
-                try:
-                    self.inst1.write(":INIT:CONT OFF")
-                except:
-                    pass
-                self.continuous1 = False
-                self.after(0, lambda: self.sa1_panel.set_continuous_active(False))
+                cfg = self._read_settings(ch)
+            except ValueError as e:
+                messagebox.showerror(f"{ch.name} Error", f"Invalid sweep settings: {e}")
+                return
         
-        thread = threading.Thread(target=do_continuous, daemon=True)
-        thread.start()
-    
-    def _update_plot1(self, freqs, vals):
-        freqs_mhz = freqs / 1e6
+        ch.continuous = not ch.continuous
+        ch.panel.set_continuous_active(ch.continuous)
         
-        if self.max_vals1 is None or self.max_freqs1 is None or len(self.max_vals1) != len(vals):
-            self.max_freqs1 = freqs.copy()
-            self.max_vals1 = vals.copy()
+        if ch.continuous:
+            ch.stop.clear()
+            self._start_continuous(ch, cfg)
         else:
-            self.max_vals1 = np.maximum(self.max_vals1, vals)
-        
-        max_freqs_mhz = self.max_freqs1 / 1e6
-        self.plot1.update_data(freqs_mhz, vals, max_freqs_mhz, self.max_vals1)
+            ch.stop.set()
     
-    def _get_freq_range_for_panel(self, panel):
-        """Get start and stop MHz values based on current frequency mode"""
-        if panel.freq_mode == "center_span":
-            center = float(panel.center_entry.get().replace(",", "."))
-            span = float(panel.span_entry.get().replace(",", "."))
-            start = center - span / 2
-            stop = center + span / 2
-            return start, stop
-        else:
-            start = float(panel.start_entry.get().replace(",", "."))
-            stop = float(panel.stop_entry.get().replace(",", "."))
-            return start, stop
-    
-    def reset_peak1(self):
-        self.max_vals1 = None
-        self.max_freqs1 = None
-        if self.plot1 is not None and self.plot1.line_max is not None:
-            try:
-                self.plot1.line_max.remove()
-            except:
-                pass
-            self.plot1.line_max = None
-            self.plot1.canvas.draw_idle()
-        self.sa1_panel.set_message("Peak hold reset")
-    
-    def reset_peak2(self):
-        self.max_vals2 = None
-        self.max_freqs2 = None
-        if self.plot2 is not None and self.plot2.line_max is not None:
-            try:
-                self.plot2.line_max.remove()
-            except:
-                pass
-            self.plot2.line_max = None
-            self.plot2.canvas.draw_idle()
-        self.sa2_panel.set_message("Peak hold reset")
-    
-    def sweep2(self, center: str = None, span: str = None, points: str = None):
-        if self.inst2 is None:
-            messagebox.showerror("SA2 Error", "SA2 not connected")
+    def _start_continuous(self, ch, cfg):
+        if not ch.continuous or ch.inst is None:
             return
         
-        def do_sweep():
-            try:
-                start_val, stop_val = self._get_freq_range_for_panel(self.sa2_panel)
-                pts = int(self.sa2_panel.points_var.get())
-                bw_res = self.sa2_panel.bw_res_var.get()
-                bw_vid = self.sa2_panel.bw_vid_var.get()
-                
-                self.after(0, lambda: self.sa2_panel.set_sweeping(True))
-                
-                self._configure_sa(self.inst2, start_val, stop_val, pts, bw_res, bw_vid)
-                self._single_sweep(self.inst2)
-                freqs, vals = self._read_trace_ascii_block(self.inst2)
-                
-                self.after(0, lambda: self._update_plot2(freqs, vals))
-                self.after(0, lambda: self.sa2_panel.set_sweeping(False))
-                self.after(0, lambda: self.sa2_panel.set_message("Sweep completed"))
-            except Exception as e:
-                error_msg = str(e)
-                self.after(0, lambda: self.sa2_panel.set_sweeping(False))
-                self.after(0, lambda: self.sa2_panel.set_message("Sweep error", is_error=True))
-                self.after(100, lambda msg=error_msg: messagebox.showerror("SA2 Error", msg))
-        
-        thread = threading.Thread(target=do_sweep, daemon=True)
+        thread = threading.Thread(target=self._do_continuous, args=(ch, cfg), daemon=True)
         thread.start()
     
-    def toggle_continuous2(self):
-        if self.inst2 is None:
-            messagebox.showerror("SA2 Error", "SA2 not connected")
-            return
-        
-        self.continuous2 = not self.continuous2
-        self.sa2_panel.set_continuous_active(self.continuous2)
-        
-        if self.continuous2:
-            self._start_continuous2()
-    
-    def _start_continuous2(self):
-        if not self.continuous2 or self.inst2 is None:
-            return
-        
-        def do_continuous():
-            sweep_count = 0
+    def _do_continuous(self, ch, cfg):
+        sweep_count = 0
+        try:
+            self._sweep_settings(ch, cfg)
+            ch.inst.write(":INIT:CONT OFF")
+            
+            original_timeout = ch.inst.timeout
+            ch.inst.timeout = 30000
+            
+            # Sweep time only depends on the settings, which are fixed for the session
             try:
-                start_val, stop_val = self._get_freq_range_for_panel(self.sa2_panel)
-                pts = int(self.sa2_panel.points_var.get())
-                bw_res = self.sa2_panel.bw_res_var.get()
-                bw_vid = self.sa2_panel.bw_vid_var.get()
-                
-                self._configure_sa(self.inst2, start_val, stop_val, pts, bw_res, bw_vid)
-                self.inst2.write(":INIT:CONT OFF")
-                time.sleep(0.3)
-                
-                original_timeout = self.inst2.timeout
-                self.inst2.timeout = 30000
-                
-                while self.continuous2 and self.inst2 is not None:
-                    try:
-                        self.inst2.write(":INIT")
-                        self.inst2.write(":SWE:TIME?")
-                        time.sleep(0.2)
-                        try:
-                            sweep_time = float(self.inst2.read())
-                        except:
-                            sweep_time = 1.5
-                        time.sleep(max(1.5, sweep_time * 1.2))
-                        freqs, vals = self._read_trace_ascii_block(self.inst2)
-                        self.after(0, lambda f=freqs, v=vals: self._update_plot2(f, v))
-                        sweep_count += 1
-                    except Exception as sweep_err:
-                        print(f"Sweep error (sweep #{sweep_count}): {sweep_err}")
-                        time.sleep(0.5)
-                        break
-                
-                self.inst2.timeout = original_timeout
-            except Exception as e:
-                print(f"Continuous sweep setup error: {e}")
-                self.after(0, lambda: self.sa2_panel.set_message("Sweep error", is_error=True))
-            finally:
+                sweep_time = float(ch.inst.query(":SWE:TIME?"))
+            except Exception:
+                sweep_time = 0.0
+            
+            # Span and points are fixed for the whole session, so the axis built
+            # from the configuration read-back serves every sweep
+            freqs = ch.freqs
+            while not ch.stop.is_set() and ch.inst is not None:
                 try:
-                    self.inst2.write(":INIT:CONT OFF")
-                except:
-                    pass
-                self.continuous2 = False
-                self.after(0, lambda: self.sa2_panel.set_continuous_active(False))
-        
-        thread = threading.Thread(target=do_continuous, daemon=True)
-        thread.start()
+                    # Poll instead of blocking on *OPC? so a stop request ends the wait immediately
+                    if not self._wait_sweep(ch.inst, ch.stop, sweep_time):
+                        break
+                    freqs, vals = self._read_trace_bin(ch.inst, freqs)
+                    with self._frame_lock:
+                        prev = ch.latest
+                        # Only the display is coalesced: a frame that replaces an undrained one
+                        # carries its peaks along, so every sweep still reaches the peak hold
+                        if prev is not None and prev[0] is freqs:
+                            peak = np.maximum(prev[2], vals)
+                        else:
+                            peak = vals
+                        ch.latest = (freqs, vals, peak)
+                        schedule = not ch.pending
+                        ch.pending = True
+                    if schedule:
+                        self.after(0, self._drain, ch)
+                    sweep_count += 1
+                except Exception as sweep_err:
+                    print(f"Sweep error (sweep #{sweep_count}): {sweep_err}")
+                    # Let the instrument settle before the cleanup below, unless stop was requested
+                    ch.stop.wait(0.5)
+                    break
+            
+            ch.inst.timeout = original_timeout
+        except Exception as e:
+            print(f"Continuous sweep setup error: {e}")
+            self.after(0, ch.panel.set_message, "Sweep error", True)
+        finally:
+            try:
+                ch.inst.write(":INIT:CONT OFF")
+            except:
+                pass
+            ch.continuous = False
+            self.after(0, ch.panel.set_continuous_active, False)
     
-    def _update_plot2(self, freqs, vals):
-        freqs_mhz = freqs / 1e6
-        
-        if self.max_vals2 is None or self.max_freqs2 is None or len(self.max_vals2) != len(vals):
-            self.max_freqs2 = freqs.copy()
-            self.max_vals2 = vals.copy()
+    def _update_plot(self, ch, freqs, vals, peak=None):
+        # peak is the element-wise maximum of vals and any sweeps coalesced into this frame
+        if peak is None:
+            peak = vals
+        
+        # Continuous sweeps hand back the same axis array every frame; convert it once
+        if freqs is not ch.freqs_src:
+            # Fresh array: the plot may still hold the previous one paired with the old trace
+            ch.freqs_mhz = freqs * 1e-6
+            ch.freqs_src = freqs
+        
+        # Peak hold always lives on the trace axis (freqs is never mutated after the read,
+        # so it is shared); a different span restarts it
+        restart = False
+        if ch.max_freqs is not freqs:
+            restart = (ch.max_freqs is None or len(ch.max_freqs) != len(freqs) or
+                       ch.max_freqs[0] != freqs[0] or ch.max_freqs[-1] != freqs[-1])
+            ch.max_freqs = freqs
+        
+        if ch.max_vals is None or len(ch.max_vals) != len(peak):
+            ch.max_vals = peak.astype(np.float32)
+        elif restart:
+            # Same point count: reuse the buffer instead of allocating a new one
+            np.copyto(ch.max_vals, peak)
         else:
-            self.max_vals2 = np.maximum(self.max_vals2, vals)
+            # No-op cast for the float32 binary traces; keeps the in-place merge allocation-free
+            np.maximum(ch.max_vals, peak.astype(ch.max_vals.dtype, copy=False), out=ch.max_vals)
         
-        max_freqs_mhz = self.max_freqs2 / 1e6
-        self.plot2.update_data(freqs_mhz, vals, max_freqs_mhz, self.max_vals2)
+        ch.plot.update_data(ch.freqs_mhz, vals, ch.freqs_mhz, ch.max_vals)
+    
+    def _get_freq_range_for_panel(self, panel):
+        """Get start and stop MHz values based on current frequency mode"""
+        return panel.get_freq_range()
+    
+    def reset_peak(self, ch):
+        if ch.max_vals is not None:
+            # -inf loses every comparison, so the next sweep simply becomes the new peak hold
+            ch.max_vals.fill(-np.inf)
+        if ch.plot is not None:
+            ch.plot.clear_max_hold()
+        ch.panel.set_message("Peak hold reset")
 
 
 def main():